@@ -1,48 +1,3 @@
-def preparse_abc_notes(abc_str, default_length=1.0):
-    """Pre-Parsing: Check each note in ABC string before main parsing. Returns error if any note fails."""
-    import re
-    original_str = abc_str
-    # Split by | but keep them
-    parts = re.split(r'(\|)', abc_str)
-    
-    all_tokens = []
-    for part in parts:
-        part = part.strip()
-        if part == '|':
-            all_tokens.append('|')
-        elif part:
-            all_tokens.extend(part.split())
-    
-    # Filter out inline time signature numbers (number after |)
-    note_strs = []
-    i = 0
-    while i < len(all_tokens):
-        token = all_tokens[i]
-        if token == '|':
-            # Check if next token is a number (inline time signature)
-            if i + 1 < len(all_tokens) and all_tokens[i + 1].isdigit():
-                i += 2  # Skip both | and the number
-                continue
-            else:
-                i += 1  # Just skip the |
-                continue
-        note_strs.append(token)
-        i += 1
-    
-    for i, note_str in enumerate(note_strs):
-        # Allow tie/legato suffix "-" (e.g. C4- C4) in pre-check by stripping it.
-        check_str = note_str
-        if isinstance(check_str, str) and check_str.endswith('-'):
-            check_str = check_str[:-1]
-            if not check_str:
-                return (None, f"Pre-parsing error: Invalid tie marker '-' at position {i+1} in sequence '{original_str}'")
-
-        parsed = parse_abc_note_with_duration(check_str, default_length)
-        if parsed is None or (isinstance(parsed, tuple) and len(parsed) == 2 and parsed[0] is None):
-            error_msg = parsed[1] if parsed and len(parsed) == 2 else "Unknown error"
-            context = " ".join(note_strs[max(0,i-1):min(len(note_strs),i+2)])
-            return (None, f"Pre-parsing error: Note '{note_str}' at position {i+1} in sequence '{original_str}' did not pass pre-check. Reason: {error_msg}\nContext: ...{context}...")
-    return True
 #!/usr/bin/env python3
 """
 Intonation Trainer – Scale-Aware Random Interval & Triad Generator (CLI)
@@ -61,13 +16,16 @@ Dependencies: pyyaml, mido, numpy, pydub
 See `requirements.txt` for an installable list.
 """
 import argparse
+import array
+import functools
+import itertools
 import os
 import sys
-import tempfile
-import shutil
 import subprocess
 import math
 import random
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
@@ -135,7 +93,6 @@ except Exception:  # pragma: no cover
     raise  # pragma: no cover
 
 import numpy as np
-import wave
 
 
 # ------------------------- Utilities ---------------------------------
@@ -149,6 +106,9 @@ def print_red(text):
 NOTE_BASE = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
 
 
+# Note names come from a small vocabulary (config, ABC notation, text logs),
+# so parsed results are memoized.
+@functools.lru_cache(maxsize=256)
 def note_name_to_midi(name: str) -> int:
     name = name.strip()
     if len(name) < 2:
@@ -172,9 +132,26 @@ def note_name_to_midi(name: str) -> int:
 
 
 def midi_to_freq(midi: int) -> float:
+    if type(midi) is int and 0 <= midi < 128:
+        return _MIDI_FREQ_TABLE[midi]
+    # Arrays, floats and notes outside the MIDI range
     return 440.0 * (2 ** ((midi - 69) / 12.0))
 
 
+# Frequencies of all 128 MIDI notes, as Python floats for midi_to_freq and as
+# an array for lookups in the synthesizer.
+_MIDI_FREQ_TABLE = tuple(440.0 * (2 ** ((m - 69) / 12.0)) for m in range(128))
+_MIDI_FREQS = np.array(_MIDI_FREQ_TABLE, dtype=np.float64)
+
+
+def _notes_to_freqs(notes):
+    """Return a float64 frequency array for an iterable of MIDI notes."""
+    midi = np.array([int(n) for n in notes], dtype=np.intp)
+    if midi.size and (midi.min() < 0 or midi.max() > 127):
+        return midi_to_freq(midi.astype(np.float64))
+    return _MIDI_FREQS[midi]
+
+
 SCALE_PATTERNS = {
     'major': [2, 2, 1, 2, 2, 2, 1],
     'natural_minor': [2, 1, 2, 2, 1, 2, 2],
@@ -187,27 +164,26 @@ SCALE_PATTERNS = {
 }
 
 
+# Semitone offsets of each scale degree from the root (the last step closes the octave).
+_SCALE_OFFSETS = {
+    kind: tuple(itertools.accumulate(pattern[:-1], initial=0))
+    for kind, pattern in SCALE_PATTERNS.items()
+}
+
+
 def build_scale_notes(root_midi: int, kind: str):
-    if kind in SCALE_PATTERNS:
-        pattern = SCALE_PATTERNS[kind]
-    else:
-        raise ValueError(f"Unknown scale type: {kind}")
-    notes = [root_midi]
-    cur = root_midi
-    for step in pattern:
-        cur += step
-        notes.append(cur)
-    return notes[:-1]
+    try:
+        offsets = _SCALE_OFFSETS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown scale type: {kind}") from None
+    return [root_midi + o for o in offsets]
 
 
 def expand_scale_over_range(scale_root_midi: int, scale_type: str, low_m: int, high_m: int):
-    base_scale = build_scale_notes(scale_root_midi % 12 + (scale_root_midi // 12) * 12, scale_type)
-    pool = []
-    for midi in range(low_m, high_m + 1):
-        semis = [n % 12 for n in base_scale]
-        if (midi % 12) in semis:
-            pool.append(midi)
-    return sorted(set(pool))
+    base_scale = build_scale_notes(scale_root_midi, scale_type)
+    pitch_classes = {n % 12 for n in base_scale}
+    # Walking the range in order already yields a sorted, duplicate-free pool.
+    return [midi for midi in range(low_m, high_m + 1) if midi % 12 in pitch_classes]
 
 
 def transpose_notes(notes_with_durations, semitones):
@@ -250,11 +226,79 @@ def transpose_notes(notes_with_durations, semitones):
     return transposed
 
 
+# libyaml's C loader when PyYAML was built with it; same safe subset as safe_load.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
 def parse_yaml(path: str) -> dict:
     with open(path, 'r', encoding='utf8') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+# abspath -> ((mtime_ns, size), parsed mapping) for load_scales_config.
+_SCALES_CFG_CACHE = {}
+
+
+def load_scales_config(path: str = 'config/scales.yaml') -> dict:
+    """Return the parsed scale accidental mapping, re-reading only when the file changes.
+
+    The result is shared between callers and must be treated as read-only.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _SCALES_CFG_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    scales_cfg = parse_yaml(key)
+    _SCALES_CFG_CACHE[key] = (stamp, scales_cfg)
+    return scales_cfg
+
+
+# ABC notation patterns, compiled once for the per-token parsers below.
+_ABC_BAR_SPLIT_RE = re.compile(r'(\|)')
+_ABC_REST_RE = re.compile(r'^([zZx])([\d.:/*]*)$')
+_ABC_NOTE_RE = re.compile(r'^([A-G])([#b]?)(\d)([#b]?)([\d.:/*]*)$', re.IGNORECASE)
+_SCALE_KEY_RE = re.compile(r'^([a-g])(?:(#|b)|(?:sharp|flat))?(major|minor|maj|min|m)$')
+_INLINE_SCALE_PREFIX_RE = re.compile(
+    r'^\s*([A-Ga-g](?:(?:#|b)|(?:sharp|flat))?\s*(?:major|minor|maj|min|m))\s*\|(.*)$',
+    re.IGNORECASE,
+)
+_ABC_LETTERS = frozenset('ABCDEFGabcdefg')
+_ABC_ACCIDENTALS = frozenset('#bB')
+_ASCII_DIGITS = frozenset('0123456789')
+_ABC_LENGTH_CHARS = frozenset('0123456789.:/*')
+
+
+def _scan_abc_note(s):
+    """Split a plain ASCII note token by hand, returning the _ABC_NOTE_RE groups.
+
+    Returns None for anything unusual so the caller can fall back to the regex.
+    """
+    n = len(s)
+    if s[0] not in _ABC_LETTERS:
+        return None
+    i = 1
+    accidental_before = ''
+    if i < n and s[i] in _ABC_ACCIDENTALS:
+        accidental_before = s[i]
+        i += 1
+    if i >= n or s[i] not in _ASCII_DIGITS:
+        return None
+    octave = s[i]
+    i += 1
+    accidental_after = ''
+    if i < n and s[i] in _ABC_ACCIDENTALS:
+        accidental_after = s[i]
+        i += 1
+    length_part = s[i:]
+    if length_part and not _ABC_LENGTH_CHARS.issuperset(length_part):
+        return None
+    return s[0], accidental_before, octave, accidental_after, length_part
 
 
+# Sequences repeat the same few tokens, and results are immutable tuples.
+@functools.lru_cache(maxsize=4096, typed=True)
 def parse_abc_note_with_duration(note_str, default_length=1.0):
     """Parse ABC note string with optional duration suffix.
     
@@ -274,7 +318,6 @@ def parse_abc_note_with_duration(note_str, default_length=1.0):
         Tuple (midi_number, duration_in_beats) or ('rest', duration) for rests
         or tuple (None, error_message) if parsing fails
     """
-    import re
     note_str = note_str.strip()
     # Erlaube ! als Override für kein Vorzeichen
     if '!' in note_str:
@@ -284,7 +327,7 @@ def parse_abc_note_with_duration(note_str, default_length=1.0):
         return (None, "Empty note string")
 
     # Check for rest notation (z, Z, or x)
-    rest_match = re.match(r'^([zZx])([\d.:/*]*)$', note_str)
+    rest_match = _ABC_REST_RE.match(note_str) if note_str[0] in 'zZx' else None
     if rest_match:
         rest_symbol = rest_match.group(1)
         length_part = rest_match.group(2)
@@ -298,15 +341,15 @@ def parse_abc_note_with_duration(note_str, default_length=1.0):
 
     # Try to parse as note: letter + optional accidental (before or after octave) + octave + optional duration
     # Support patterns: C#4, C4#, Db4, D4b, C4:1.5, C42, C4/2, C4*2
-    match = re.match(r'^([A-G])([#b]?)(\d)([#b]?)([\d.:/*]*)$', note_str, re.IGNORECASE)
-    if not match:
-        return (None, f"Invalid note format '{note_str}'. Expected format: <Letter>[#/b]<Octave>[duration], e.g., 'C4', 'F#3', 'G4:1.5', 'A#42', 'Bb4/2'")
+    groups = _scan_abc_note(note_str)
+    if groups is None:
+        match = _ABC_NOTE_RE.match(note_str)
+        if not match:
+            return (None, f"Invalid note format '{note_str}'. Expected format: <Letter>[#/b]<Octave>[duration], e.g., 'C4', 'F#3', 'G4:1.5', 'A#42', 'Bb4/2'")
+        groups = match.groups()
 
-    letter = match.group(1).upper()
-    accidental_before = match.group(2)
-    octave = match.group(3)
-    accidental_after = match.group(4)
-    length_part = match.group(5)
+    letter, accidental_before, octave, accidental_after, length_part = groups
+    letter = letter.upper()
 
     # Combine accidentals (prefer one before octave, but accept after)
     accidental = accidental_before or accidental_after
@@ -345,13 +388,14 @@ def _parse_duration_modifier(length_str, default_length):
     if not length_str:
         return default_length
     
-    if length_str.startswith(':'):
+    op = length_str[0]
+    if op == ':':
         # Explicit duration: :1.5
         try:
             return float(length_str[1:])
         except ValueError:
             raise ValueError(f"Cannot parse explicit duration '{length_str[1:]}' as number")
-    elif length_str.startswith('/'):
+    elif op == '/':
         # Division: /2 means half duration
         try:
             divisor = float(length_str[1:])
@@ -360,7 +404,7 @@ def _parse_duration_modifier(length_str, default_length):
             return default_length / divisor
         except ValueError as e:
             raise ValueError(f"Cannot parse divisor '{length_str[1:]}': {e}")
-    elif length_str.startswith('*'):
+    elif op == '*':
         # Multiplication: *2 means double duration
         try:
             multiplier = float(length_str[1:])
@@ -492,6 +536,67 @@ def validate_time_signature(notes_with_durations, time_signature='4/4', sequence
     return (True, None, has_partial_start, has_partial_end)
 
 
+def _abc_tokens(abc_str):
+    """Split an ABC string into note/rest tokens, keeping bar lines as '|' tokens."""
+    tokens = []
+    for part in _ABC_BAR_SPLIT_RE.split(abc_str):
+        part = part.strip()
+        if part == '|':
+            tokens.append('|')
+        elif part:
+            tokens.extend(part.split())
+    return tokens
+
+
+def _precheck_abc_tokens(tokens, original_str, default_length):
+    """Parse every note token of an ABC sequence once.
+
+    Returns the list of parse results (one per note token, inline time
+    signature numbers after '|' skipped) or (None, error_message) for the
+    first note that fails.
+    """
+    # Filter out inline time signature numbers (number after |)
+    note_strs = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '|':
+            # Check if next token is a number (inline time signature)
+            if i + 1 < len(tokens) and tokens[i + 1].isdigit():
+                i += 2  # Skip both | and the number
+                continue
+            else:
+                i += 1  # Just skip the |
+                continue
+        note_strs.append(token)
+        i += 1
+
+    results = []
+    for i, note_str in enumerate(note_strs):
+        # Allow tie/legato suffix "-" (e.g. C4- C4) in pre-check by stripping it.
+        check_str = note_str
+        if check_str.endswith('-'):
+            check_str = check_str[:-1]
+            if not check_str:
+                return (None, f"Pre-parsing error: Invalid tie marker '-' at position {i+1} in sequence '{original_str}'")
+
+        parsed = parse_abc_note_with_duration(check_str, default_length)
+        if parsed is None or (isinstance(parsed, tuple) and len(parsed) == 2 and parsed[0] is None):
+            error_msg = parsed[1] if parsed and len(parsed) == 2 else "Unknown error"
+            context = " ".join(note_strs[max(0,i-1):min(len(note_strs),i+2)])
+            return (None, f"Pre-parsing error: Note '{note_str}' at position {i+1} in sequence '{original_str}' did not pass pre-check. Reason: {error_msg}\nContext: ...{context}...")
+        results.append(parsed)
+    return results
+
+
+def preparse_abc_notes(abc_str, default_length=1.0):
+    """Pre-Parsing: Check each note in ABC string before main parsing. Returns error if any note fails."""
+    result = _precheck_abc_tokens(_abc_tokens(abc_str), abc_str, default_length)
+    if isinstance(result, tuple):
+        return result
+    return True
+
+
 def parse_abc_sequence(abc_str, default_length=1.0, scale_name=None, include_markers=False):
     """Parse ABC notation sequence with durations into list of (midi, duration) tuples.
     
@@ -513,28 +618,16 @@ def parse_abc_sequence(abc_str, default_length=1.0, scale_name=None, include_mar
         Optionally includes ('measure_start', beats) and ('measure_end', None) markers
         or tuple (None, error_message) if parsing fails
     """
-    # Pre-parsing check
-    precheck = preparse_abc_notes(abc_str, default_length)
-    if precheck is not True:
-        return precheck
     original_str = abc_str
-    
-    # Parse with measure tracking
-    # Split by | but keep track of them
-    import re
     # Split on | and keep the bars and content between them
-    parts = re.split(r'(\|)', abc_str)
-    
-    tokens = []
-    for part in parts:
-        part = part.strip()
-        if part == '|':
-            tokens.append('|')
-        elif part:
-            # Split into individual note/rest tokens
-            for token in part.split():
-                if token.strip():
-                    tokens.append(token.strip())
+    tokens = _abc_tokens(abc_str)
+
+    # Pre-parsing check: every note is parsed once here, and the main loop
+    # below reuses that result unless a scale/override changes the note.
+    precheck = _precheck_abc_tokens(tokens, original_str, default_length)
+    if isinstance(precheck, tuple):
+        return precheck
+    note_index = 0
     
     if not tokens or (len(tokens) == 1 and tokens[0] == '|'):
         return (None, f"No notes found in ABC sequence '{original_str}'")
@@ -561,8 +654,7 @@ def parse_abc_sequence(abc_str, default_length=1.0, scale_name=None, include_mar
         compact = ''.join(ch for ch in name if not ch.isspace())
         compact_lower = compact.lower()
 
-        import re
-        m = re.match(r'^([a-g])(?:(#|b)|(?:sharp|flat))?(major|minor|maj|min|m)$', compact_lower)
+        m = _SCALE_KEY_RE.match(compact_lower)
         if m:
             letter = m.group(1).upper()
             accidental_token = m.group(2)
@@ -603,7 +695,7 @@ def parse_abc_sequence(abc_str, default_length=1.0, scale_name=None, include_mar
     scale_map = None
     if scale_name:
         try:
-            scales_cfg = parse_yaml('config/scales.yaml')
+            scales_cfg = load_scales_config()
             resolved = _resolve_scale_key_for_accidentals(scale_name, scales_cfg)
             scale_map = scales_cfg.get(resolved) if resolved else None
         except Exception:
@@ -636,6 +728,8 @@ def parse_abc_sequence(abc_str, default_length=1.0, scale_name=None, include_mar
             continue
         
         note_str = token
+        raw_parsed = precheck[note_index]
+        note_index += 1
 
         # Detect tie suffix (e.g., C4-). The continuation note is expected later.
         tie_to_next = False
@@ -658,7 +752,7 @@ def parse_abc_sequence(abc_str, default_length=1.0, scale_name=None, include_mar
             override = 'b'
 
         # Extrahiere Buchstaben und Oktave
-        m = re.match(r'^([A-G])([#b]?)(\d)([#b]?)([\d.:/*]*)$', note_base, re.IGNORECASE)
+        m = _ABC_NOTE_RE.match(note_base)
         if m:
             letter = m.group(1).upper()
             accidental_before = m.group(2)
@@ -675,10 +769,13 @@ def parse_abc_sequence(abc_str, default_length=1.0, scale_name=None, include_mar
                 accidental = scale_map.get(letter, '')
             note_name_part = letter + accidental + octave
             note_str_mod = note_name_part + length_part
-            parsed = parse_abc_note_with_duration(note_str_mod, default_length)
+            if note_str_mod == note_str:
+                parsed = raw_parsed
+            else:
+                parsed = parse_abc_note_with_duration(note_str_mod, default_length)
         else:
             # Rest oder ungültig
-            parsed = parse_abc_note_with_duration(note_str, default_length)
+            parsed = raw_parsed
         if parsed is None or (isinstance(parsed, tuple) and len(parsed) == 2 and parsed[0] is None):
             error_msg = parsed[1] if parsed and len(parsed) == 2 else "Unknown error"
             position_info = f"at position '{note_str}'"
@@ -734,13 +831,7 @@ def extract_inline_scale_prefix(seq_str, default_scale_name=None):
     if not isinstance(seq_str, str):
         return default_scale_name, seq_str
 
-    import re
-
-    match = re.match(
-        r'^\s*([A-Ga-g](?:(?:#|b)|(?:sharp|flat))?\s*(?:major|minor|maj|min|m))\s*\|(.*)$',
-        seq_str,
-        re.IGNORECASE,
-    )
+    match = _INLINE_SCALE_PREFIX_RE.match(seq_str)
     if not match:
         return default_scale_name, seq_str
 
@@ -866,148 +957,177 @@ def parse_sequences_from_config(sequences_cfg, default_unit_length=1.0):
 
 
 # ------------------ Helpers extracted from main for testing -----------------
+_PITCH_CLASS_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+# Names for the whole MIDI range, e.g. _NOTE_NAMES[60] == 'C4'.
+_NOTE_NAMES = tuple(f"{_PITCH_CLASS_NAMES[m % 12]}{(m // 12) - 1}" for m in range(128))
+
+
 def midi_to_note_name(midi: int) -> str:
+    if 0 <= midi < 128:
+        return _NOTE_NAMES[midi]
     octave = (midi // 12) - 1
     pc = midi % 12
-    names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-    name = names[pc]
-    return f"{name}{octave}"
+    return f"{_PITCH_CLASS_NAMES[pc]}{octave}"
+
+
+# Preformatted ":d" durations for the common note lengths in the text log.
+_BEAT_FMT = {v: f"{v:.2f}" for v in (0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0)}
+
+
+def _format_timed_notes(items, beats_per_measure, ticks_per_beat):
+    """Format (midi|'rest', beats[, ...]) items with |M<n>| measure markers."""
+    if not items:
+        return ''
+    beats = np.array([float(item[1]) for item in items], dtype=np.float64)
+    # Beats elapsed before each note (exclusive running sum) decide its measure;
+    # a marker is written whenever a note starts past the highest measure so far.
+    starts = np.zeros_like(beats)
+    np.cumsum(beats[:-1], out=starts[1:])
+    measures = (starts // float(beats_per_measure)).astype(np.int64) + 1
+    seen = np.zeros_like(measures)
+    np.maximum.accumulate(measures[:-1], out=seen[1:])
+    new_measure = (measures > seen).tolist()
+    ticks = (beats * float(ticks_per_beat)).astype(np.int64).tolist()
+    measures = measures.tolist()
+    beats = beats.tolist()
+
+    parts = []
+    append = parts.append
+    beat_fmt = _BEAT_FMT.get
+    note_name = midi_to_note_name
+    for i, item in enumerate(items):
+        if new_measure[i]:
+            append(f"|M{measures[i]}|")
+        b = beats[i]
+        bstr = beat_fmt(b) or f"{b:.2f}"
+        n = item[0]
+        if n == 'rest':
+            append(f"REST:d{bstr}:t{ticks[i]}")
+        else:
+            append(f"{note_name(n)}({int(n)}):d{bstr}:t{ticks[i]}")
+    return ' '.join(parts)
 
 
 def write_text_log(path: str, exercises_list, ticks_per_beat: int = None, scale_name: str = 'session', time_signature: str = '4/4'):
     """Write text log with measure markers based on time signature."""
-    with open(path, 'w', encoding='utf8') as f:
-        f.write(f"Intonation Trainer Log\n")
-        f.write(f"Scale: {scale_name}\n")
-        f.write(f"Time Signature: {time_signature}\n")
-        f.write(f"Generated: {len(exercises_list)} exercises (with repetitions)\n\n")
-        
-        # Parse time signature to get beats per measure
-        try:
-            beats_per_measure = int(time_signature.split('/')[0])
-        except:
-            beats_per_measure = 4  # Default to 4/4
-        
-        for i, ex in enumerate(exercises_list, start=1):
-            if ex[0] == 'interval':
-                a, b = ex[1], ex[2]
-                f.write(f"{i:04d}: INTERVAL  {midi_to_note_name(a)} ({a}) -> {midi_to_note_name(b)} ({b})\n")
-            elif ex[0] == 'triad':
-                notes = ex[1]
-                names = ' '.join([f"{midi_to_note_name(n)}({n})" for n in notes])
-                f.write(f"{i:04d}: TRIAD     {names}\n")
-            elif ex[0] == 'chord':
-                notes = ex[1]
-                names = ' '.join([f"{midi_to_note_name(n)}({n})" for n in notes])
-                f.write(f"{i:04d}: CHORD    {names}\n")
-            elif ex[0] == 'rhythm_vocal':
-                notes_with_dur = ex[1]
-                if ticks_per_beat is None:
-                    ticks_per_beat = 480
-                parts = []
-                cumulative_beats = 0.0
-                measure_num = 0  # Start at 0 so first note triggers M1
-                for n, d in notes_with_dur:
-                    # Check if we're at the start of a new measure
-                    current_measure = int(cumulative_beats // beats_per_measure) + 1
-                    if current_measure > measure_num:
-                        parts.append(f"|M{current_measure}|")
-                        measure_num = current_measure
-                    
-                    name = midi_to_note_name(n)
-                    midi_num = int(n)
-                    beats = float(d)
-                    ticks = int(beats * ticks_per_beat)
-                    parts.append(f"{name}({midi_num}):d{beats:.2f}:t{ticks}")
-                    cumulative_beats += beats
-                names = ' '.join(parts)
-                f.write(f"{i:04d}: RHYTHM_VOCAL  {names}\n")
-            elif ex[0] == 'sequence':
-                notes_with_dur = ex[1]
-                if notes_with_dur and isinstance(notes_with_dur[0], tuple):
-                    if ticks_per_beat is None:
-                        ticks_per_beat = 480
-                    parts = []
-                    cumulative_beats = 0.0
-                    measure_num = 0  # Start at 0 so first note triggers M1
-                    for item in notes_with_dur:
-                        # Check if we're at the start of a new measure
-                        current_measure = int(cumulative_beats // beats_per_measure) + 1
-                        if current_measure > measure_num:
-                            parts.append(f"|M{current_measure}|")
-                            measure_num = current_measure
-                        
-                        if item[0] == 'rest':
-                            # Rest notation
-                            beats = float(item[1])
-                            ticks = int(beats * ticks_per_beat)
-                            parts.append(f"REST:d{beats:.2f}:t{ticks}")
-                        else:
-                            # Regular note
-                            n = item[0]
-                            d = item[1]
-                            name = midi_to_note_name(n)
-                            midi_num = int(n)
-                            beats = float(d)
-                            ticks = int(beats * ticks_per_beat)
-                            parts.append(f"{name}({midi_num}):d{beats:.2f}:t{ticks}")
-                        cumulative_beats += beats
-                    names = ' '.join(parts)
-                else:
-                    names = ' '.join([f"{midi_to_note_name(n)}({n})" for n in notes_with_dur])
-                f.write(f"{i:04d}: SEQUENCE  {names}\n")
+    if ticks_per_beat is None:
+        ticks_per_beat = 480
+    # Parse time signature to get beats per measure
+    try:
+        beats_per_measure = int(time_signature.split('/')[0])
+    except:
+        beats_per_measure = 4  # Default to 4/4
+
+    lines = [
+        "Intonation Trainer Log",
+        f"Scale: {scale_name}",
+        f"Time Signature: {time_signature}",
+        f"Generated: {len(exercises_list)} exercises (with repetitions)",
+        "",
+    ]
+    append = lines.append
+    note_name = midi_to_note_name
+    for i, ex in enumerate(exercises_list, start=1):
+        kind = ex[0]
+        if kind == 'interval':
+            a, b = ex[1], ex[2]
+            append(f"{i:04d}: INTERVAL  {note_name(a)} ({a}) -> {note_name(b)} ({b})")
+        elif kind == 'triad':
+            notes = ex[1]
+            names = ' '.join([f"{note_name(n)}({n})" for n in notes])
+            append(f"{i:04d}: TRIAD     {names}")
+        elif kind == 'chord':
+            notes = ex[1]
+            names = ' '.join([f"{note_name(n)}({n})" for n in notes])
+            append(f"{i:04d}: CHORD    {names}")
+        elif kind == 'rhythm_vocal':
+            names = _format_timed_notes(ex[1], beats_per_measure, ticks_per_beat)
+            append(f"{i:04d}: RHYTHM_VOCAL  {names}")
+        elif kind == 'sequence':
+            notes_with_dur = ex[1]
+            if notes_with_dur and isinstance(notes_with_dur[0], tuple):
+                names = _format_timed_notes(notes_with_dur, beats_per_measure, ticks_per_beat)
             else:
-                f.write(f"{i:04d}: UNKNOWN   {ex}\n")
+                names = ' '.join([f"{note_name(n)}({n})" for n in notes_with_dur])
+            append(f"{i:04d}: SEQUENCE  {names}")
+        else:
+            append(f"{i:04d}: UNKNOWN   {ex}")
+    append("")  # trailing newline
+
+    # Build the whole log in memory and hand it to the file in one write.
+    with open(path, 'w', encoding='utf8') as f:
+        f.write('\n'.join(lines))
     return path
 
 
+# Matches one exercise line of a whole log buffer (MULTILINE; never crosses a newline).
+_LOG_LINE_RE = re.compile(r'^[^:\n]*:[^\S\n]*(INTERVAL|TRIAD|CHORD|SEQUENCE)(.*)', re.M)
+_LOG_MIDI_RE = re.compile(r'\((\d+)\)')
+_LOG_SEQ_NOTE_RE = re.compile(r'([A-G][#b]?\d)\((\d+)\)')
+
+
+def _parse_log_interval(body):
+    matches = _LOG_MIDI_RE.findall(body)
+    if len(matches) >= 2:
+        return ('interval', int(matches[0]), int(matches[1]))
+    return None
+
+
+def _log_note_group_parser(kind):
+    """Return a parser for TRIAD/CHORD bodies producing (kind, notes)."""
+    def parse(body):
+        matches = _LOG_MIDI_RE.findall(body)
+        if len(matches) >= 3:
+            return (kind, tuple(int(m) for m in matches))
+        return None
+    return parse
+
+
+def _parse_log_sequence(body):
+    # parse simple sequence names (no durations)
+    matches = _LOG_SEQ_NOTE_RE.findall(body)
+    if matches:
+        return ('sequence', [int(m[1]) for m in matches])
+    return None
+
+
+_LOG_LINE_PARSERS = {
+    'INTERVAL': _parse_log_interval,
+    'TRIAD': _log_note_group_parser('triad'),
+    'CHORD': _log_note_group_parser('chord'),
+    'SEQUENCE': _parse_log_sequence,
+}
+
+
 def parse_text_log(path: str):
     """Parse exercises from a text log file generated by write_text_log."""
     exercises = []
     try:
         with open(path, 'r', encoding='utf8') as f:
-            for line in f:
-                line = line.strip()
-                if not line or ':' not in line:
-                    continue
-                parts = line.split(':', 1)
-                if len(parts) < 2:
-                    continue
-                content = parts[1].strip()
-                if content.startswith('INTERVAL'):
-                    rest = content[len('INTERVAL'):].strip()
-                    import re
-                    matches = re.findall(r'\((\d+)\)', rest)
-                    if len(matches) >= 2:
-                        a, b = int(matches[0]), int(matches[1])
-                        exercises.append(('interval', a, b))
-                elif content.startswith('TRIAD'):
-                    rest = content[len('TRIAD'):].strip()
-                    import re
-                    matches = re.findall(r'\((\d+)\)', rest)
-                    if len(matches) >= 3:
-                        notes = tuple(int(m) for m in matches)
-                        exercises.append(('triad', notes))
-                elif content.startswith('CHORD'):
-                    rest = content[len('CHORD'):].strip()
-                    import re
-                    matches = re.findall(r'\((\d+)\)', rest)
-                    if len(matches) >= 3:
-                        notes = tuple(int(m) for m in matches)
-                        exercises.append(('chord', notes))
-                elif content.startswith('SEQUENCE'):
-                    # parse simple sequence names (no durations)
-                    rest = content[len('SEQUENCE'):].strip()
-                    import re
-                    matches = re.findall(r'([A-G][#b]?\d)\((\d+)\)', rest)
-                    if matches:
-                        notes = [int(m[1]) for m in matches]
-                        exercises.append(('sequence', notes))
+            data = f.read()
+        # Header and blank lines are skipped inside the regex engine.
+        for m in _LOG_LINE_RE.finditer(data):
+            ex = _LOG_LINE_PARSERS[m.group(1)](m.group(2))
+            if ex is not None:
+                exercises.append(ex)
     except Exception:
         return []
     return exercises
 
 
+def session_output_name(cfg: dict, args, scale_label: str) -> str:
+    """Return the session output filename.
+
+    `--output` wins; otherwise `output.filename` is formatted with the scale
+    label and a timestamp taken once per call.
+    """
+    if getattr(args, 'output', None):
+        return args.output
+    fname_template = cfg.get('output', {}).get('filename', 'Intonation_{scale}_{date}.mp3')
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return fname_template.format(scale=scale_label.replace(' ', '_'), date=timestamp)
+
+
 def build_final_list(cfg: dict, args) -> tuple:
     """Construct the final_list of exercises based on cfg and CLI-like args.
 
@@ -1020,11 +1140,16 @@ def build_final_list(cfg: dict, args) -> tuple:
     else:
         max_duration_seconds = config_max_duration
 
-    vocal = cfg.get('vocal_range', {})
+    # Bind config subtrees once; everything below reads these locals.
+    vocal = cfg.get('vocal_range') or {}
+    vocal_mode = vocal.get('mode', 'note_chains')
+    timing = cfg.get('timing') or {}
+    scale_cfg = cfg.get('scale') or {}
+    repetitions_per_exercise_cfg = cfg.get('repetitions_per_exercise', 1)
+
     lowest = note_name_to_midi(vocal.get('lowest_note', 'A3'))
     highest = note_name_to_midi(vocal.get('highest_note', 'A4'))
 
-    repetitions = cfg.get('repetitions_per_exercise', 10)
     seed = cfg.get('random_seed', None)
     if seed is not None:
         random.seed(seed)
@@ -1038,33 +1163,31 @@ def build_final_list(cfg: dict, args) -> tuple:
     elif sequences_cfg:
         exercises = parse_sequences_from_config(sequences_cfg)
     else:
-        scale_cfg = cfg.get('scale', {})
         # Vocal-range only modes: if neither scale nor sequences are provided.
         if not scale_cfg:
-            vocal_mode = (cfg.get('vocal_range', {}) or {}).get('mode', 'note_chains')
             if vocal_mode == 'scale_step_triads':
                 exercises = generate_vocal_range_scale_step_triads(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                 )
             elif vocal_mode == 'scale_step_triads_13531':
                 exercises = generate_vocal_range_scale_step_triads_13531(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                 )
             elif vocal_mode == 'scale_step_minor_triads_13531':
                 exercises = generate_vocal_range_scale_step_minor_triads_13531(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                 )
             elif vocal_mode == 'ladder_down':
                 exercises = generate_vocal_range_ladder_down(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                     steps_down=vocal.get('steps_down', 5),
                     step_semitones=vocal.get('step_semitones', 2),
                     start_step_semitones=vocal.get('start_step_semitones', 1),
@@ -1119,7 +1242,6 @@ def build_final_list(cfg: dict, args) -> tuple:
 
     # Nur mischen, wenn keine sequences verwendet werden (Skalen/Intervalle/Triaden)
     # vocal_range modes that are step-based should be deterministic (no shuffle).
-    vocal_mode = (cfg.get('vocal_range', {}) or {}).get('mode', None)
     step_based_vocal_modes = (
         'scale_step_triads',
         'scale_step_triads_13531',
@@ -1129,12 +1251,11 @@ def build_final_list(cfg: dict, args) -> tuple:
     if not sequences_cfg and vocal_mode not in step_based_vocal_modes:
         random.shuffle(exercises)
     # timing
-    note_duration = cfg.get('timing', {}).get('note_duration', 1.8)
-    pause_between_reps = cfg.get('timing', {}).get('pause_between_reps', 1.0)
+    note_duration = timing.get('note_duration', 1.8)
+    pause_between_reps = timing.get('pause_between_reps', 1.0)
     time_per_exercise = note_duration + pause_between_reps
 
     exercises_count_cfg = cfg.get('exercises_count', None)
-    repetitions_per_exercise_cfg = cfg.get('repetitions_per_exercise', 1)
 
     exercises_count = None
     if exercises_count_cfg is not None:
@@ -1171,26 +1292,17 @@ def build_final_list(cfg: dict, args) -> tuple:
                 final_list = exercises[:max(1, max_count)]
         elif sequences_cfg:
             # Blockweise Wiederholung: Jede Sequenz n-mal hintereinander
-            final_list = []
-            for ex in exercises:
-                for _ in range(repetitions_per_exercise_cfg):
-                    final_list.append(ex)
+            final_list = [ex for ex in exercises for _ in range(repetitions_per_exercise_cfg)]
         else:
             # Standardverhalten für Skalen/Intervalle/Triaden
-            for ex in exercises:
-                for _ in range(actual_reps):
-                    final_list.append(ex)
+            final_list = [ex for ex in exercises for _ in range(actual_reps)]
             if exercises_count is not None and len(final_list) > exercises_count:
-                final_list = final_list[:exercises_count]
+                del final_list[exercises_count:]
 
     estimated_duration = len(final_list) * time_per_exercise
 
-    # determine out_name similar to main
-    outcfg = cfg.get('output', {})
-    fname_template = outcfg.get('filename', 'Intonation_{scale}_{date}.mp3')
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    scale_label = cfg.get('scale', {}).get('name', scale_name)
-    out_name = getattr(args, 'output', None) or fname_template.format(scale=scale_label.replace(' ', '_'), date=timestamp)
+    scale_label = scale_cfg.get('name', scale_name)
+    out_name = session_output_name(cfg, args, scale_label)
 
     return final_list, scale_name, out_name, estimated_duration
 
@@ -1342,8 +1454,7 @@ def generate_vocal_range_scale_step_minor_triads_13531(lowest: int, highest: int
     return exercises
 
 
-def append_exercise_to_session_track(
-    track,
+def build_exercise_messages(
     ex,
     *,
     velocity: int,
@@ -1352,42 +1463,48 @@ def append_exercise_to_session_track(
     intra_interval_gap: float,
     rest_between: float,
 ):
-    """Append one exercise to a session MIDI track.
+    """Return the MIDI messages (delta-timed) for one exercise of a session track.
 
     Supported exercise types: interval, triad (sequential), chord (simultaneous), rhythm_vocal, sequence.
     """
+    msgs = []
+    # Fixed note length shared by interval/triad/chord notes and plain sequences.
+    note_ticks = secs_to_ticks(note_dur)
     if ex[0] == 'interval':
         a, b = int(ex[1]), int(ex[2])
-        track.append(Message('note_on', note=a, velocity=velocity, time=0))
-        track.append(Message('note_off', note=a, velocity=0, time=secs_to_ticks(note_dur)))
-        track.append(Message('note_on', note=b, velocity=velocity, time=secs_to_ticks(intra_interval_gap)))
-        track.append(Message('note_off', note=b, velocity=0, time=secs_to_ticks(note_dur)))
-        track.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
+        msgs.append(Message('note_on', note=a, velocity=velocity, time=0))
+        msgs.append(Message('note_off', note=a, velocity=0, time=note_ticks))
+        msgs.append(Message('note_on', note=b, velocity=velocity, time=secs_to_ticks(intra_interval_gap)))
+        msgs.append(Message('note_off', note=b, velocity=0, time=note_ticks))
+        msgs.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
     elif ex[0] == 'triad':
         notes = [int(n) for n in ex[1]]
         for n in notes:
-            track.append(Message('note_on', note=n, velocity=velocity, time=0))
-            track.append(Message('note_off', note=n, velocity=0, time=secs_to_ticks(note_dur)))
-        track.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
+            msgs.append(Message('note_on', note=n, velocity=velocity, time=0))
+            msgs.append(Message('note_off', note=n, velocity=0, time=note_ticks))
+        msgs.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
     elif ex[0] == 'chord':
         notes = [int(n) for n in ex[1]]
         if notes:
             for n in notes:
-                track.append(Message('note_on', note=n, velocity=velocity, time=0))
-            track.append(Message('note_off', note=notes[0], velocity=0, time=secs_to_ticks(note_dur)))
+                msgs.append(Message('note_on', note=n, velocity=velocity, time=0))
+            msgs.append(Message('note_off', note=notes[0], velocity=0, time=note_ticks))
             for n in notes[1:]:
-                track.append(Message('note_off', note=n, velocity=0, time=0))
-        track.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
+                msgs.append(Message('note_off', note=n, velocity=0, time=0))
+        msgs.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
     elif ex[0] == 'rhythm_vocal':
         notes_with_dur = ex[1]
         for midi_note, dur in notes_with_dur:
             midi_note = int(midi_note)
             ticks = secs_to_ticks(dur)
-            track.append(Message('note_on', note=midi_note, velocity=velocity, time=0))
-            track.append(Message('note_off', note=midi_note, velocity=0, time=ticks))
-        track.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
+            msgs.append(Message('note_on', note=midi_note, velocity=velocity, time=0))
+            msgs.append(Message('note_off', note=midi_note, velocity=0, time=ticks))
+        msgs.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
     elif ex[0] == 'sequence':
         seq = ex[1]
+        # Rest ticks not yet emitted; they become the delta time of the next
+        # note_on (or of the closing pause) instead of a message of their own.
+        pending_ticks = 0
         if seq and isinstance(seq[0], tuple):
             # Support tied/legato notes encoded as (midi, dur, 'tie') for continuation.
             active_note = None
@@ -1400,11 +1517,10 @@ def append_exercise_to_session_track(
                 if midi_note == 'rest':
                     # Flush any active note before a rest.
                     if active_note is not None:
-                        track.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
+                        msgs.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
                         active_note = None
                         active_ticks = 0
-                    ticks = secs_to_ticks(dur)
-                    track.append(mido.MetaMessage('track_name', name='', time=ticks))
+                    pending_ticks += secs_to_ticks(dur)
                     continue
 
                 midi_note_int = int(midi_note)
@@ -1415,8 +1531,9 @@ def append_exercise_to_session_track(
                     if active_note is None or active_note != midi_note_int:
                         # Should not happen if parsing is correct; degrade gracefully.
                         if active_note is not None:
-                            track.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
-                        track.append(Message('note_on', note=midi_note_int, velocity=velocity, time=0))
+                            msgs.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
+                        msgs.append(Message('note_on', note=midi_note_int, velocity=velocity, time=pending_ticks))
+                        pending_ticks = 0
                         active_note = midi_note_int
                         active_ticks = ticks
                     else:
@@ -1424,52 +1541,63 @@ def append_exercise_to_session_track(
                 else:
                     # Start a new note (flush previous one if any)
                     if active_note is not None:
-                        track.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
-                    track.append(Message('note_on', note=midi_note_int, velocity=velocity, time=0))
+                        msgs.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
+                    msgs.append(Message('note_on', note=midi_note_int, velocity=velocity, time=pending_ticks))
+                    pending_ticks = 0
                     active_note = midi_note_int
                     active_ticks = ticks
 
             # Flush any remaining active note
             if active_note is not None:
-                track.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
+                msgs.append(Message('note_off', note=active_note, velocity=0, time=active_ticks))
         else:
             notes = [int(n) for n in seq]
             for n in notes:
-                track.append(Message('note_on', note=n, velocity=velocity, time=0))
-                track.append(Message('note_off', note=n, velocity=0, time=secs_to_ticks(note_dur)))
-        track.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
+                msgs.append(Message('note_on', note=n, velocity=velocity, time=0))
+                msgs.append(Message('note_off', note=n, velocity=0, time=note_ticks))
+        msgs.append(mido.MetaMessage('track_name', name='', time=pending_ticks + secs_to_ticks(rest_between)))
     else:
-        track.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
+        msgs.append(mido.MetaMessage('track_name', name='', time=secs_to_ticks(rest_between)))
+    return msgs
+
+
+def append_exercise_to_session_track(track, ex, **kwargs):
+    """Append one exercise to a session MIDI track (see build_exercise_messages)."""
+    track.extend(build_exercise_messages(ex, **kwargs))
 
 
 
 # ---------------------- Exercise generation ---------------------------
+#
+# Exercises are plain tuples tagged by their first element:
+#   ('interval', a, b)
+#   ('triad', (n1, n2, n3))        notes played one after another
+#   ('chord', (n1, n2, n3))        notes played together
+#   ('rhythm_vocal', [(midi, beats), ...])
+#   ('sequence', [midi, ...]) or ('sequence', [(midi|'rest', beats[, 'tie']), ...])
+# Plain tuples are as small as NamedTuple records and much cheaper to build,
+# and final_list repeats references rather than copies.
 
 def generate_intervals(pool_notes, ascending=True, descending=True, max_interval=12, include_m3=False):
-    intervals = []
     n = len(pool_notes)
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            a = pool_notes[i]
-            b = pool_notes[j]
-            semis = b - a
-            if abs(semis) > max_interval:
-                continue
-            if semis > 0 and not ascending:
-                continue
-            if semis < 0 and not descending:
-                continue
-            intervals.append(('interval', a, b))
-    unique = []
-    seen = set()
-    for it in intervals:
-        key = (it[1], it[2])
-        if key not in seen:
-            seen.add(key)
-            unique.append(it)
-    return unique
+    # All ordered pairs (i, j), i != j, as an n x n mask; np.nonzero walks it
+    # row by row, i.e. in the same order as a nested i/j loop.
+    a = np.asarray(pool_notes)
+    semis = a[None, :] - a[:, None]
+    ok = np.abs(semis) <= max_interval
+    np.fill_diagonal(ok, False)
+    if not ascending:
+        ok &= semis <= 0
+    if not descending:
+        ok &= semis >= 0
+    ii, jj = np.nonzero(ok)
+    intervals = [('interval', pool_notes[i], pool_notes[j]) for i, j in zip(ii.tolist(), jj.tolist())]
+    # Pools built from a scale are already duplicate-free, so every (a, b)
+    # pair above is unique and the dedup pass can be skipped.
+    if len(set(pool_notes)) == n:
+        return intervals
+    # Order-preserving dedup: dict keys keep the first occurrence of each pair.
+    return list(dict.fromkeys(intervals))
 
 
 def generate_rhythm_vocal_exercises(base_note, num_exercises=10, max_pattern_length=8):
@@ -1530,42 +1658,43 @@ def generate_triads(scale_notes_single_octave_midi, pool_notes, include_inversio
     that contains notes outside the inclusive range [low, high] will be discarded.
     """
     triads = []
-    semitone_to_index = {n % 12: i for i, n in enumerate(scale_notes_single_octave_midi)}
+    scale = scale_notes_single_octave_midi
+    semitone_to_index = {n % 12: i for i, n in enumerate(scale)}
+    # A bare string (e.g. `types: major` in YAML) names a single quality.
+    wanted_qualities = frozenset((triad_types,) if isinstance(triad_types, str) else triad_types)
+    # Per scale degree: semitone offsets of the three triad notes from the pool
+    # note, and the triad quality. Filled on first use of each degree.
+    degree_shapes = {}
+
+    def in_range(notes_tuple):
+        return ((low is None or min(notes_tuple) >= low)
+                and (high is None or max(notes_tuple) <= high))
+
     for root in pool_notes:
-        root_pc = root % 12
-        if root_pc not in semitone_to_index:
+        deg = semitone_to_index.get(root % 12)
+        if deg is None:
             continue
-        deg = semitone_to_index[root_pc]
-        tri = []
-        for offset in (0, 2, 4):
-            idx = (deg + offset) % 7
-            octave_shift = (deg + offset) // 7
-            pitch = (scale_notes_single_octave_midi[idx] - scale_notes_single_octave_midi[0]) + root + octave_shift * 12
-            tri.append(pitch)
-        a, b, c = tri
-        int1 = b - a
-        int2 = c - b
-        quality = None
-        if int1 == 4 and int2 == 3:
-            quality = 'major'
-        elif int1 == 3 and int2 == 4:
-            quality = 'minor'
-        elif int1 == 3 and int2 == 3:
-            quality = 'diminished'
-        else:
-            quality = 'other'
-
-        def in_range(notes_tuple):
-            if low is None and high is None:
-                return True
-            for p in notes_tuple:
-                if low is not None and p < low:
-                    return False
-                if high is not None and p > high:
-                    return False
-            return True
-
-        if quality in triad_types:
+        shape = degree_shapes.get(deg)
+        if shape is None:
+            offsets = tuple(
+                scale[(deg + offset) % 7] - scale[0] + ((deg + offset) // 7) * 12
+                for offset in (0, 2, 4)
+            )
+            int1 = offsets[1] - offsets[0]
+            int2 = offsets[2] - offsets[1]
+            if int1 == 4 and int2 == 3:
+                quality = 'major'
+            elif int1 == 3 and int2 == 4:
+                quality = 'minor'
+            elif int1 == 3 and int2 == 3:
+                quality = 'diminished'
+            else:
+                quality = 'other'
+            shape = degree_shapes[deg] = (offsets, quality)
+        offsets, quality = shape
+        tri = [root + offsets[0], root + offsets[1], root + offsets[2]]
+
+        if quality in wanted_qualities:
             base_tri = tuple(tri)
             if in_range(base_tri):
                 triads.append(('triad', base_tri))
@@ -1577,13 +1706,8 @@ def generate_triads(scale_notes_single_octave_midi, pool_notes, include_inversio
                 if in_range(inv2):
                     triads.append(('triad', inv2))
 
-    uniq = []
-    seen = set()
-    for t in triads:
-        if t[1] not in seen:
-            seen.add(t[1])
-            uniq.append(t)
-    return uniq
+    # Order-preserving dedup: dict keys keep the first occurrence of each triad.
+    return list(dict.fromkeys(triads))
 
 
 # ---------------------- Audio rendering -------------------------------
@@ -1597,30 +1721,87 @@ def write_midi_for_exercise(events, midi_path, tempo_bpm=120, channel=0):
     mid.tracks.append(track)
     track.append(mido.MetaMessage('set_tempo', tempo=bpm2tempo(tempo_bpm)))
     ticks_per_beat = mid.ticks_per_beat
-    for note, start, dur, vel in events:
-        start_ticks = int(start * (ticks_per_beat * tempo_bpm / 60.0))
-        duration_ticks = int(dur * (ticks_per_beat * tempo_bpm / 60.0))
-        track.append(Message('note_on', note=note, velocity=vel, time=0))
-        track.append(Message('note_off', note=note, velocity=0, time=duration_ticks))
+    # Notes are written back to back: each note_off follows its note_on by
+    # the note's duration and the start times are not used.
+    durations = np.array([ev[2] for ev in events], dtype=np.float64)
+    duration_ticks = (durations * (ticks_per_beat * tempo_bpm / 60.0)).astype(np.int64).tolist()
+    msgs = []
+    for (note, _start, _dur, vel), ticks in zip(events, duration_ticks):
+        msgs.append(Message('note_on', note=note, velocity=vel, time=0))
+        msgs.append(Message('note_off', note=note, velocity=0, time=ticks))
+    track.extend(msgs)
     mid.save(midi_path)
 
 
+_SYNTH_CORE = None
+
+
+def _get_synth_core():
+    """Return the Numba-compiled additive synth kernel, or None without Numba.
+
+    Numba is optional and only imported on first use so MIDI-only runs do not
+    pay its import cost.
+    """
+    global _SYNTH_CORE
+    if _SYNTH_CORE is None:
+        try:
+            import numba
+        except Exception:  # pragma: no cover
+            _SYNTH_CORE = False
+            return None
+
+        @numba.njit(parallel=True, fastmath=True, cache=True)
+        def _synth_core(freqs, t, out):  # pragma: no cover (compiled)
+            for k in numba.prange(t.size):
+                x = t[k]
+                s = 0.0
+                for i in range(freqs.size):
+                    s += math.sin(2.0 * math.pi * freqs[i] * x)
+                out[k] = 0.6 * math.exp(-3.0 * x) * s
+
+        _SYNTH_CORE = _synth_core
+    return _SYNTH_CORE or None
+
+
 def synth_simple_wav(notes, duration, out_wav, sample_rate=44100, velocity=90):
     t = np.linspace(0, duration, int(sample_rate * duration), False)
-    data = np.zeros_like(t)
-    for n in notes:
-        freq = midi_to_freq(int(n))
-        tone = 0.6 * np.sin(2 * np.pi * freq * t) * np.exp(-3 * t)
-        data += tone
+    # Samples are summed in float32; only time and phase need float64.
+    data = np.zeros(t.size, dtype=np.float32)
+    synth_core = _get_synth_core()
+    freqs = _notes_to_freqs(notes)
+    if synth_core is not None:
+        synth_core(freqs, t, data)
+    else:
+        # Sum the raw sines into `data` through reusable scratch buffers and
+        # apply the shared decay envelope once at the end. The phase is wrapped
+        # to one cycle in float64 first, so the float32 sin stays accurate
+        # for long and high notes.
+        cycles = np.empty_like(t)
+        tmp = np.empty(t.size, dtype=np.float32)
+        for freq in freqs:
+            np.multiply(t, freq, out=cycles)
+            np.subtract(cycles, np.floor(cycles), out=cycles)
+            np.multiply(cycles, 2 * np.pi, out=cycles)
+            tmp[...] = cycles
+            np.sin(tmp, out=tmp)
+            data += tmp
+        data *= np.exp(-3 * t, dtype=np.float32) * np.float32(0.6)
     maxv = np.max(np.abs(data))
     if maxv > 0:
-        data = data / maxv * 0.9
-    audio = (data * 32767).astype(np.int16)
+        data *= np.float32(0.9 / maxv)
+    data *= np.float32(32767)
+    audio = data.astype(np.int16)
+    import wave
     with wave.open(out_wav, 'w') as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(sample_rate)
-        wf.writeframes(audio.tobytes())
+        _write_int16_frames(wf, audio)
+
+
+def _write_int16_frames(wf, a):
+    """Write an int16 array to an open wave writer without a tobytes() copy."""
+    wf.writeframes(np.ascontiguousarray(a).data)
 
 
 def make_silence_ms(ms, sr=44100):
@@ -1639,34 +1820,51 @@ def normalize_int16(arr):
     if a.size == 0:
         return a.astype(np.int16)
     if a.dtype == np.int16:
-        mx = np.max(np.abs(a))
+        # Peak from max/min avoids an abs() temporary (and its int16 overflow
+        # at -32768). Scale exactly by 32767/mx in int32 instead of a float64
+        # round-trip, truncating toward zero like the float cast did.
+        mx = max(int(a.max()), -int(a.min()))
         if mx == 0:
             return a
-        scale = 32767.0 / float(mx)
-        out = (a.astype(np.float64) * scale).astype(np.int16)
-        return out
+        out = np.multiply(a, 32767, dtype=np.int32)
+        neg = out < 0
+        np.negative(out, out=out, where=neg)
+        out //= mx
+        np.negative(out, out=out, where=neg)
+        return out.astype(np.int16)
     else:
-        mx = np.max(np.abs(a))
+        # Peak from max/min (as Python floats, so unsigned input cannot wrap)
+        # avoids an abs() temporary.
+        mx = max(float(a.max()), -float(a.min()))
         if mx == 0:
             return a.astype(np.int16)
-        scaled = a.astype(np.float64) / mx * 32767.0
-        return scaled.astype(np.int16)
+        # One multiply in float64 straight into the int16 output, with no
+        # float copy of the input. Nudge the scale up if rounding would leave
+        # the peak just below 32767 and truncate it to 32766.
+        scale = 32767.0 / mx
+        if mx * scale < 32767.0:
+            scale = np.nextafter(scale, np.inf)
+        out = np.empty(a.shape, dtype=np.int16)
+        np.multiply(a, scale, out=out, dtype=np.float64, casting='unsafe')
+        return out
 
 
 def write_wav_mono(path, arr, sr=44100):
-    """Write a mono int16 numpy array to a WAV file."""
+    """Write a mono int16 numpy array to a WAV file (path or binary file object)."""
     a = np.asarray(arr)
     if a.dtype != np.int16:
         a = normalize_int16(a)
+    import wave
     with wave.open(path, 'w') as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(int(sr))
-        wf.writeframes(a.tobytes())
+        _write_int16_frames(wf, a)
 
 
 def read_wav_mono(path):
-    """Read a mono WAV file and return (numpy int16 array, sample_rate)."""
+    """Read a mono WAV file (path or binary file object) and return (numpy int16 array, sample_rate)."""
+    import wave
     with wave.open(path, 'rb') as wf:
         channels = wf.getnchannels()
         sampwidth = wf.getsampwidth()
@@ -1676,8 +1874,9 @@ def read_wav_mono(path):
         raise RuntimeError('Unsupported sample width')
     arr = np.frombuffer(frames, dtype=np.int16)
     if channels > 1:
-        # Reduce to mono by taking first channel
-        arr = arr[::channels]
+        # Downmix to mono by averaging the interleaved channels (int32 sum
+        # so the reduction cannot overflow).
+        arr = (arr.reshape(-1, channels).sum(axis=1, dtype=np.int32) // channels).astype(np.int16)
     return arr, sr
 
 
@@ -1696,14 +1895,6 @@ def main():
     args = parser.parse_args()
 
     cfg = parse_yaml(args.config)
-    outcfg = cfg.get('output', {})
-    fname_template = outcfg.get('filename', 'Intonation_{scale}_{date}.mp3')
-    fmt = outcfg.get('format', 'mp3')
-    normalize_lufs = outcfg.get('normalize_lufs', -16)
-
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    scale_name = cfg.get('scale', {}).get('name', 'scale')
-    out_name = args.output or fname_template.format(scale=scale_name.replace(' ', '_'), date=timestamp)
 
     # Use module-level helpers (midi_to_note_name / write_text_log / parse_text_log).
 
@@ -1714,11 +1905,20 @@ def main():
     else:
         max_duration_seconds = config_max_duration
 
-    vocal = cfg.get('vocal_range', {})
+    vocal = cfg.get('vocal_range') or {}
     lowest = note_name_to_midi(vocal.get('lowest_note', 'A3'))
     highest = note_name_to_midi(vocal.get('highest_note', 'A4'))
+    vocal_mode = vocal.get('mode')
+    # Step-based modes keep their generated order and play each step once per cycle
+    step_based_mode = vocal_mode in (
+        'scale_step_triads',
+        'scale_step_triads_13531',
+        'scale_step_minor_triads_13531',
+        'ladder_down',
+    )
 
-    repetitions = cfg.get('repetitions_per_exercise', 10)
+    timing = cfg.get('timing') or {}
+    repetitions_per_exercise_cfg = cfg.get('repetitions_per_exercise', 1)
     seed = cfg.get('random_seed', None)
     if seed is not None:
         random.seed(seed)
@@ -1755,35 +1955,30 @@ def main():
     else:
         # Feature: Note-Chains aus vocal_range, wenn weder scale noch sequences im Config stehen
         scale_cfg = cfg.get('scale', {})
-        sequences_cfg = cfg.get('sequences', None)
         if not scale_cfg and not sequences_cfg:
-            vocal = cfg.get('vocal_range', {})
-            lowest = note_name_to_midi(vocal.get('lowest_note', 'A3'))
-            highest = note_name_to_midi(vocal.get('highest_note', 'A4'))
-            vocal_mode = vocal.get('mode', 'note_chains')
             if vocal_mode == 'scale_step_triads':
                 exercises = generate_vocal_range_scale_step_triads(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                 )
             elif vocal_mode == 'scale_step_triads_13531':
                 exercises = generate_vocal_range_scale_step_triads_13531(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                 )
             elif vocal_mode == 'scale_step_minor_triads_13531':
                 exercises = generate_vocal_range_scale_step_minor_triads_13531(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                 )
             elif vocal_mode == 'ladder_down':
                 exercises = generate_vocal_range_ladder_down(
                     lowest,
                     highest,
-                    repetitions_per_step=cfg.get('repetitions_per_exercise', 1),
+                    repetitions_per_step=repetitions_per_exercise_cfg,
                     steps_down=vocal.get('steps_down', 5),
                     step_semitones=vocal.get('step_semitones', 2),
                     start_step_semitones=vocal.get('start_step_semitones', 1),
@@ -1843,25 +2038,17 @@ def main():
                 exercises += rhythm_exercises
 
     # Nur mischen, wenn keine sequences verwendet werden (Skalen/Intervalle/Triaden)
-    vocal_mode = (cfg.get('vocal_range', {}) or {}).get('mode', None)
-    step_based_vocal_modes = (
-        'scale_step_triads',
-        'scale_step_triads_13531',
-        'scale_step_minor_triads_13531',
-        'ladder_down',
-    )
-    if not sequences_cfg and vocal_mode not in step_based_vocal_modes:
+    if not sequences_cfg and not step_based_mode:
         random.shuffle(exercises)
     final_list = []
     # Calculate actual repetitions based on max_duration target
-    note_duration = cfg.get('timing', {}).get('note_duration', 1.8)
-    pause_between_reps = cfg.get('timing', {}).get('pause_between_reps', 1.0)
+    note_duration = timing.get('note_duration', 1.8)
+    pause_between_reps = timing.get('pause_between_reps', 1.0)
     # Each exercise takes ~note_duration + pause_between_reps seconds
     time_per_exercise = note_duration + pause_between_reps
     
     # Get configuration for exercise count and repetitions
     exercises_count_cfg = cfg.get('exercises_count', None)
-    repetitions_per_exercise_cfg = cfg.get('repetitions_per_exercise', 1)
     
     # Convert exercises_count to integer if provided
     exercises_count = None
@@ -1898,81 +2085,67 @@ def main():
     
     # Build final list as cyclic block pattern: repeat all sequences repetitions_per_exercise times, then next block, until max_duration
     final_list = []
-    # Track which original exercise each item in final_list came from (for pause_between_blocks)
-    exercise_indices = []
+    # Track which original exercise each item in final_list came from (for pause_between_blocks),
+    # packed as C ints rather than a list of Python ints
+    exercise_indices = array.array('i')
     if len(exercises) > 0:
         if args.from_text:
             # When loading from text, use exercises as-is without repetition
             # Respect exercises_count if set
             if exercises_count is not None and exercises_count > 0:
                 final_list = exercises[:exercises_count]
-                exercise_indices = list(range(len(final_list)))
+                exercise_indices = array.array('i', range(len(final_list)))
             else:
                 max_count = int(max_duration_seconds / time_per_exercise)
                 final_list = exercises[:max(1, max_count)]
-                exercise_indices = list(range(len(final_list)))
+                exercise_indices = array.array('i', range(len(final_list)))
         elif sequences_cfg:
             # Blockwise repetition for sequences: each sequence repeated n times before moving to next
-            for ex_idx, ex in enumerate(exercises):
-                for _ in range(repetitions_per_exercise_cfg):
-                    final_list.append(ex)
-                    exercise_indices.append(ex_idx)
+            reps = repetitions_per_exercise_cfg
+            final_list = [ex for ex in exercises for _ in range(reps)]
+            exercise_indices = array.array('i', [ex_idx for ex_idx in range(len(exercises)) for _ in range(reps)])
             # Am Ende alle sequences als eine kombinierte Sequenz anhängen, wiederholt
             if combine_sequences_to_one:
                 # Kombiniere alle sequences zu einer einzigen
-                combined_notes = []
-                for ex in exercises:
-                    if ex[0] == 'sequence':
-                        combined_notes.extend(ex[1])
+                combined_notes = [n for ex in exercises if ex[0] == 'sequence' for n in ex[1]]
                 combined_ex = ('sequence', combined_notes)
                 combined_idx = len(exercises)  # Use a new index for combined sequence
-                for _ in range(repetitions_per_exercise_cfg):
-                    final_list.append(combined_ex)
-                    exercise_indices.append(combined_idx)
+                final_list += [combined_ex] * reps
+                exercise_indices += array.array('i', [combined_idx]) * reps
         else:
             # For intervals/triads, use duration-based filling
-            vocal_mode = (cfg.get('vocal_range', {}) or {}).get('mode', None)
-            total_time = 0.0
-            while True:
-                for ex_idx, ex in enumerate(exercises):
-                    reps_for_this_ex = 1 if vocal_mode in step_based_vocal_modes else actual_reps
-                    for _ in range(reps_for_this_ex):
-                        if exercises_count is not None and len(final_list) >= exercises_count:
-                            break
-                        if total_time + time_per_exercise > max_duration_seconds:
-                            break
-                        final_list.append(ex)
-                        exercise_indices.append(ex_idx)
-                        total_time += time_per_exercise
-                    if exercises_count is not None and len(final_list) >= exercises_count:
-                        break
-                    if total_time + time_per_exercise > max_duration_seconds:
-                        break
-                # Abbruch, wenn Zeit oder Anzahl erreicht
-                if exercises_count is not None and len(final_list) >= exercises_count:
-                    break
-                if total_time + time_per_exercise > max_duration_seconds:
-                    break
+            # Cycle through all exercises (each repeated reps_for_this_ex times)
+            # until the duration or exercises_count limit is reached.
+            max_total = int(max_duration_seconds / time_per_exercise)
+            if exercises_count is not None:
+                max_total = min(max_total, exercises_count)
+            max_total = max(0, max_total)
+            reps_for_this_ex = 1 if step_based_mode else actual_reps
+            unit = [ex for ex in exercises for _ in range(reps_for_this_ex)]
+            unit_idx = array.array('i', [ex_idx for ex_idx in range(len(exercises)) for _ in range(reps_for_this_ex)])
+            if unit:
+                cycles = -(-max_total // len(unit))
+                final_list = (unit * cycles)[:max_total]
+                exercise_indices = (unit_idx * cycles)[:max_total]
     
     # Calculate estimated final duration
     estimated_duration = len(final_list) * time_per_exercise
     
     if not args.dry_run:
-        print(f'Target duration: {max_duration_seconds}s ({max_duration_seconds//60}m {max_duration_seconds%60}s)')
-        print(f'Estimated duration: ~{int(estimated_duration)}s ({int(estimated_duration)//60}m {int(estimated_duration)%60}s)')
-        print(f'Generated {len(final_list)} exercises from {len(exercises)} unique exercise(s)')
-        print()
+        sys.stdout.write(
+            f'Target duration: {max_duration_seconds}s ({max_duration_seconds//60}m {max_duration_seconds%60}s)\n'
+            f'Estimated duration: ~{int(estimated_duration)}s ({int(estimated_duration)//60}m {int(estimated_duration)%60}s)\n'
+            f'Generated {len(final_list)} exercises from {len(exercises)} unique exercise(s)\n'
+            '\n'
+        )
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    out_name = args.output or fname_template.format(scale=scale_name.replace(' ', '_'), date=timestamp)
+    out_name = session_output_name(cfg, args, scale_name)
+    out_base = os.path.splitext(out_name)[0]
 
-    tmpdir = tempfile.mkdtemp(prefix='intonation_')
-    parts = []
     # If dry run requested, write only the text log and exit (no audio rendering)
     if args.dry_run:
-        text_path = args.text_file or (os.path.splitext(out_name)[0] + '.txt')
+        text_path = args.text_file or (out_base + '.txt')
         write_text_log(text_path, final_list, scale_name=scale_name, time_signature=time_signature)
-        shutil.rmtree(tmpdir)
         return
 
     # Prepare sound config early (velocity used for MIDI creation)
@@ -1984,23 +2157,29 @@ def main():
     # Also build a combined MIDI file representing the whole session so the
     # user can open it in a MIDI editor. This MIDI is written regardless
     # of whether FluidSynth is used for audio rendering.
+    midi_save = None
+    # The text log uses the session MIDI's resolution once it exists.
+    ticks_per_beat = 480
     if final_list:
         try:
             session_mid = MidiFile()
             track = MidiTrack()
             session_mid.tracks.append(track)
-            tempo_bpm = cfg.get('timing', {}).get('intro_bpm', 120)
+            tempo_bpm = timing.get('intro_bpm', 120)
             track.append(mido.MetaMessage('set_tempo', tempo=bpm2tempo(tempo_bpm)))
             ticks_per_beat = session_mid.ticks_per_beat
             # helper to convert seconds -> ticks (approx using bpm)
+            ticks_per_second = ticks_per_beat * tempo_bpm / 60.0
+
             def secs_to_ticks(s):
-                return int(s * (ticks_per_beat * tempo_bpm / 60.0))
+                return int(s * ticks_per_second)
 
-            note_dur = cfg.get('timing', {}).get('note_duration', 1.8)
+            note_dur = timing.get('note_duration', 1.8)
             intra_interval_gap = 0.1  # 100 ms gap between two notes of an interval
-            pause_between_reps = cfg.get('timing', {}).get('pause_between_reps', 1.0)
-            pause_between_blocks = cfg.get('timing', {}).get('pause_between_blocks', 2.0)
+            pause_between_reps = timing.get('pause_between_reps', 1.0)
+            pause_between_blocks = timing.get('pause_between_blocks', 2.0)
 
+            session_msgs = []
             for i, ex in enumerate(final_list):
                 # Determine which pause to use after this exercise
                 if i < len(final_list) - 1:
@@ -2012,8 +2191,7 @@ def main():
                     # Last exercise, use pause_between_reps
                     rest_between = pause_between_reps
 
-                append_exercise_to_session_track(
-                    track,
+                session_msgs += build_exercise_messages(
                     ex,
                     velocity=velocity,
                     secs_to_ticks=secs_to_ticks,
@@ -2021,31 +2199,39 @@ def main():
                     intra_interval_gap=intra_interval_gap,
                     rest_between=rest_between,
                 )
+            track.extend(session_msgs)
 
-            base = os.path.splitext(out_name)[0]
-            session_midi_path = base + '.mid'
-            session_mid.save(session_midi_path)
-            print(f'Wrote session MIDI to {session_midi_path}')
+            session_midi_path = out_base + '.mid'
             # Audio rendering removed: this tool now produces MIDI files only.
             # Skip the rest of the audio rendering pipeline (fluidsynth/ffmpeg/pydub).
             if not args.verbose:
                 # If user did not request verbose text log, exit now after writing MIDI
+                session_mid.save(session_midi_path)
+                print(f'Wrote session MIDI to {session_midi_path}')
                 return
-            # If verbose requested, fall through to write the text log and then exit
+            # If verbose requested, save the MIDI on a worker thread while the
+            # text log is built, then wait for it before exiting
+            pool = ThreadPoolExecutor(max_workers=1)
+            midi_save = pool.submit(session_mid.save, session_midi_path)
+            pool.shutdown(wait=False)
         except Exception as e:
             print(f'Warning: failed to write session MIDI: {e}')
 
     try:
         # No audio rendering: write the text log using the actual MIDI ticks per beat
-        text_path = args.text_file or (os.path.splitext(out_name)[0] + '.txt')
-        ticks_val = session_mid.ticks_per_beat if 'session_mid' in locals() else 480
-        write_text_log(text_path, final_list, ticks_per_beat=ticks_val, scale_name=scale_name, time_signature=time_signature)
+        text_path = args.text_file or (out_base + '.txt')
+        write_text_log(text_path, final_list, ticks_per_beat=ticks_per_beat, scale_name=scale_name, time_signature=time_signature)
         return
     except Exception as e:
         print(f'Warning: failed to write text log: {e}')
 
     finally:
-        shutil.rmtree(tmpdir)
+        if midi_save is not None:
+            try:
+                midi_save.result()
+                print(f'Wrote session MIDI to {session_midi_path}')
+            except Exception as e:
+                print(f'Warning: failed to write session MIDI: {e}')
 
 
 if __name__ == '__main__':
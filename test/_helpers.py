@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Shared helpers for the unit tests."""
+
+from typing import Optional
+
+
+class Args:
+    """Stand-in for the argparse namespace consumed by build_final_list.
+
+    Uses __slots__ (no per-instance __dict__); dataclass(slots=True) would
+    need Python 3.10, and CI still runs 3.9.
+    """
+    __slots__ = ('max_duration', 'from_text', 'output')
+
+    def __init__(self, max_duration: int = 1, from_text: Optional[str] = None, output: Optional[str] = None):
+        self.max_duration = max_duration
+        self.from_text = from_text
+        self.output = output
@@ -126,6 +126,39 @@ class TestAppendExerciseToSessionTrack(unittest.TestCase):
         self.assertGreaterEqual(len(note_on), 2)
         self.assertGreaterEqual(len(note_off), 2)
 
+    def test_sequence_rests_fold_into_next_note_on(self):
+        _, secs_to_ticks = self._mk_track()
+        ex = ('sequence', [(60, 0.1), ('rest', 0.2), ('rest', 0.1), (62, 0.1), ('rest', 0.5)])
+        msgs = trainer.build_exercise_messages(
+            ex,
+            velocity=90,
+            secs_to_ticks=secs_to_ticks,
+            note_dur=0.1,
+            intra_interval_gap=0.0,
+            rest_between=1.0,
+        )
+        note_on = [m for m in msgs if m.type == 'note_on']
+        self.assertEqual(note_on[1].time, secs_to_ticks(0.2) + secs_to_ticks(0.1))
+        # Only the closing pause remains as a meta message; it carries the trailing rest.
+        metas = [m for m in msgs if m.type == 'track_name']
+        self.assertEqual(len(metas), 1)
+        self.assertEqual(metas[0].time, secs_to_ticks(0.5) + secs_to_ticks(1.0))
+
+    def test_build_exercise_messages_matches_append(self):
+        track, secs_to_ticks = self._mk_track()
+        ex = ('triad', (60, 64, 67))
+        kwargs = dict(
+            velocity=90,
+            secs_to_ticks=secs_to_ticks,
+            note_dur=0.1,
+            intra_interval_gap=0.0,
+            rest_between=0.5,
+        )
+        msgs = trainer.build_exercise_messages(ex, **kwargs)
+        self.assertEqual(len(track), 0)
+        trainer.append_exercise_to_session_track(track, ex, **kwargs)
+        self.assertEqual(list(track), msgs)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,12 +3,22 @@
 import os
 import tempfile
 import unittest
-from types import SimpleNamespace
+
+from mido import MidiFile, MidiTrack
 
 import intonation_trainer as trainer
+from _helpers import Args
+
+
+def _secs_to_ticks(s, tpb):
+    return int(s * tpb)
 
 
 class TestBuildFinalList(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._TPB = MidiFile().ticks_per_beat
+
     def test_build_final_list_sequences_repetition(self):
         cfg = {
             'output': {'filename': 'Seq_{date}.mp3'},
@@ -23,7 +33,7 @@ class TestBuildFinalList(unittest.TestCase):
             'repetitions_per_exercise': 3,
             'max_duration': 1,
         }
-        args = SimpleNamespace(max_duration=1, from_text=None, output=None)
+        args = Args(max_duration=1, from_text=None, output=None)
         final_list, scale_name, out_name, estimated_duration = trainer.build_final_list(cfg, args)
         self.assertEqual(scale_name, 'session')
         self.assertTrue(out_name.endswith('.mp3'))
@@ -47,7 +57,7 @@ class TestBuildFinalList(unittest.TestCase):
                 'max_duration': 1,
                 'exercises_count': 2,
             }
-            args = SimpleNamespace(max_duration=1, from_text=in_txt, output=None)
+            args = Args(max_duration=1, from_text=in_txt, output=None)
             final_list, scale_name, out_name, estimated_duration = trainer.build_final_list(cfg, args)
             self.assertEqual(len(final_list), 2)
             self.assertEqual(scale_name, 'session')
@@ -65,7 +75,7 @@ class TestBuildFinalList(unittest.TestCase):
             'max_note_chain_length': 3,
             'max_interval_length': 3,
         }
-        args = SimpleNamespace(max_duration=1, from_text=None, output=None)
+        args = Args(max_duration=1, from_text=None, output=None)
         final_list, scale_name, out_name, estimated_duration = trainer.build_final_list(cfg, args)
         self.assertEqual(scale_name, 'vocal_range')
         self.assertTrue(len(final_list) >= 1)
@@ -88,7 +98,7 @@ class TestBuildFinalList(unittest.TestCase):
             'random_seed': 123,
             'max_duration': 1,
         }
-        args = SimpleNamespace(max_duration=1, from_text=None, output=None)
+        args = Args(max_duration=1, from_text=None, output=None)
         final_list, scale_name, out_name, estimated_duration = trainer.build_final_list(cfg, args)
         self.assertEqual(scale_name, 'C major')
         self.assertTrue(len(final_list) >= 1)
@@ -98,15 +108,8 @@ class TestBuildFinalList(unittest.TestCase):
     def test_append_exercise_to_session_track_graceful_tie_degrade(self):
         # Cover the defensive branch in append_exercise_to_session_track where a tie continuation
         # appears without a matching active note.
-        from mido import MidiFile, MidiTrack
-
-        mid = MidiFile()
         track = MidiTrack()
-        mid.tracks.append(track)
-        ticks_per_beat = mid.ticks_per_beat
-
-        def secs_to_ticks(s):
-            return int(s * ticks_per_beat)
+        tpb = self._TPB
 
         seq = [
             (trainer.note_name_to_midi('C4'), 0.1, 'tie'),
@@ -118,7 +121,7 @@ class TestBuildFinalList(unittest.TestCase):
             track,
             ex,
             velocity=90,
-            secs_to_ticks=secs_to_ticks,
+            secs_to_ticks=lambda s: _secs_to_ticks(s, tpb),
             note_dur=0.1,
             intra_interval_gap=0.0,
             rest_between=0.0,
@@ -5,8 +5,10 @@ import yaml
 import intonation_trainer
 
 class TestCombineSequencesToOne(unittest.TestCase):
-    def setUp(self):
-        self.config = {
+    @classmethod
+    def setUpClass(cls):
+        # Shared, read-only fixture: tests copy any sub-dict they change.
+        cls.config = {
             'sequences': {
                 'signature': '4/4',
                 'unit_length': 1.0,
@@ -20,20 +22,17 @@ class TestCombineSequencesToOne(unittest.TestCase):
             },
             'repetitions_per_exercise': 3
         }
+        cls.exercises = intonation_trainer.parse_sequences_from_config(cls.config['sequences'])
 
     def test_combine_sequences_to_one(self):
         # Simulate main logic for sequence block
-        exercises = intonation_trainer.parse_sequences_from_config(self.config['sequences'])
+        exercises = self.exercises
         repetitions = self.config['repetitions_per_exercise']
         # Blockwise repetition
-        final_list = []
-        for ex in exercises:
-            for _ in range(repetitions):
-                final_list.append(ex)
+        final_list = [ex for ex in exercises for _ in range(repetitions)]
         # Feature: combine_sequences_to_one
         if self.config['sequences'].get('combine_sequences_to_one', True):
-            for ex in exercises:
-                final_list.append(ex)
+            final_list += exercises
         # Check that the last N items are the original exercises in order
         self.assertEqual(final_list[-len(exercises):], exercises)
         # Check total length
@@ -41,15 +40,13 @@ class TestCombineSequencesToOne(unittest.TestCase):
 
     def test_combine_sequences_to_one_false(self):
         # Same config, but feature off
-        config = self.config.copy()
-        config['sequences'] = dict(config['sequences'])
-        config['sequences']['combine_sequences_to_one'] = False
+        config = {
+            **self.config,
+            'sequences': {**self.config['sequences'], 'combine_sequences_to_one': False},
+        }
         exercises = intonation_trainer.parse_sequences_from_config(config['sequences'])
         repetitions = config['repetitions_per_exercise']
-        final_list = []
-        for ex in exercises:
-            for _ in range(repetitions):
-                final_list.append(ex)
+        final_list = [ex for ex in exercises for _ in range(repetitions)]
         # Feature off: nothing appended
         self.assertEqual(len(final_list), len(exercises) * repetitions)
 
@@ -64,18 +61,11 @@ class TestRepeatCombinedSequence(unittest.TestCase):
 
     def test_repeat_combined_sequence(self):
         # Simuliere die Logik aus main()
-        final_list = []
-        for ex in self.sequences:
-            for _ in range(self.repetitions):
-                final_list.append(ex)
+        final_list = [ex for ex in self.sequences for _ in range(self.repetitions)]
         # Feature: combine_sequences_to_one
-        combined_notes = []
-        for ex in self.sequences:
-            if ex[0] == 'sequence':
-                combined_notes.extend(ex[1])
+        combined_notes = [n for ex in self.sequences if ex[0] == 'sequence' for n in ex[1]]
         combined_ex = ('sequence', combined_notes)
-        for _ in range(self.repetitions):
-            final_list.append(combined_ex)
+        final_list += [combined_ex] * self.repetitions
         # Die letzten N Einträge müssen die kombinierte Sequenz sein
         for i in range(1, self.repetitions+1):
             self.assertEqual(final_list[-i], combined_ex)
@@ -11,6 +11,7 @@ Tests for:
 
 import unittest
 import tempfile
+import io
 import os
 import sys
 import numpy as np
@@ -51,6 +52,14 @@ class TestNoteConversionEdgeCases(unittest.TestCase):
         with self.assertRaises(ValueError):
             trainer.note_name_to_midi('X')  # Too short
 
+    def test_midi_to_note_name_table_and_fallback(self):
+        """Test note names inside and outside the 0..127 MIDI range."""
+        self.assertEqual(trainer.midi_to_note_name(0), 'C-1')
+        self.assertEqual(trainer.midi_to_note_name(61), 'C#4')
+        self.assertEqual(trainer.midi_to_note_name(127), 'G9')
+        self.assertEqual(trainer.midi_to_note_name(128), 'G#9')
+        self.assertEqual(trainer.midi_to_note_name(-1), 'B-2')
+
     def test_midi_to_freq_edge_cases(self):
         """Test frequency conversion for boundary MIDI values."""
         # C0 (lowest general MIDI)
@@ -203,6 +212,14 @@ class TestWAVHelperEdgeCases(unittest.TestCase):
         result = trainer.normalize_int16(arr)
         self.assertEqual(result.max(), 32767)
 
+    def test_normalize_int16_negative_peak(self):
+        """Test that an int16 -32768 peak is scaled without overflow."""
+        arr = np.array([-32768, 16384, 0], dtype=np.int16)
+        result = trainer.normalize_int16(arr)
+        self.assertEqual(result.dtype, np.int16)
+        self.assertEqual(result.min(), -32767)
+        self.assertEqual(result[1], 16383)
+
     def test_normalize_int16_float_input(self):
         """Test normalization with float input."""
         arr = np.array([0.5, 1.0, 0.75], dtype=np.float32)
@@ -210,32 +227,72 @@ class TestWAVHelperEdgeCases(unittest.TestCase):
         self.assertEqual(result.dtype, np.int16)
         self.assertGreater(result.max(), 0)
 
+    def test_normalize_int16_float_peak_reaches_full_scale(self):
+        """Test that the float peak maps to exactly 32767 for awkward peak values."""
+        for peak in (0.1, 0.3, 1e-3, 7.0, 12345.678):
+            with self.subTest(peak=peak):
+                arr = np.array([peak / 3, -peak, peak / 2], dtype=np.float64)
+                result = trainer.normalize_int16(arr)
+                self.assertEqual(result[1], -32767)
+
     def test_write_and_read_wav_mono_various_rates(self):
-        """Test WAV I/O with various sample rates."""
+        """Test in-memory WAV I/O with various sample rates."""
+        for sr in [8000, 16000, 44100, 48000]:
+            with self.subTest(sr=sr):
+                buf = io.BytesIO()
+                data = np.array([0, 1000, -1000, 500], dtype=np.int16)
+
+                trainer.write_wav_mono(buf, data, sr)
+                buf.seek(0)
+                read_data, read_sr = trainer.read_wav_mono(buf)
+
+                self.assertEqual(read_sr, sr)
+                np.testing.assert_array_equal(read_data, data)
+
+    def test_write_and_read_wav_mono_file_path(self):
+        """Test WAV I/O through a file path."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            for sr in [8000, 16000, 44100, 48000]:
-                with self.subTest(sr=sr):
-                    wav_path = os.path.join(tmpdir, f'test_{sr}.wav')
-                    data = np.array([0, 1000, -1000, 500], dtype=np.int16)
-                    
-                    trainer.write_wav_mono(wav_path, data, sr)
-                    read_data, read_sr = trainer.read_wav_mono(wav_path)
-                    
-                    self.assertEqual(read_sr, sr)
-                    np.testing.assert_array_equal(read_data, data)
+            wav_path = os.path.join(tmpdir, 'test.wav')
+            data = np.array([0, 1000, -1000, 500], dtype=np.int16)
+
+            trainer.write_wav_mono(wav_path, data, 22050)
+            read_data, read_sr = trainer.read_wav_mono(wav_path)
+
+            self.assertEqual(read_sr, 22050)
+            np.testing.assert_array_equal(read_data, data)
 
     def test_write_wav_mono_float_input(self):
         """Test WAV writing with float input (should normalize)."""
+        buf = io.BytesIO()
+        data = np.array([0.1, 0.5, -0.3, 0.2], dtype=np.float32)
+
+        trainer.write_wav_mono(buf, data, 44100)
+        buf.seek(0)
+        read_data, read_sr = trainer.read_wav_mono(buf)
+
+        self.assertEqual(read_sr, 44100)
+        self.assertEqual(len(read_data), len(data))
+        self.assertEqual(read_data.dtype, np.int16)
+
+    def test_read_wav_mono_downmixes_stereo(self):
+        """Test that multichannel WAV input is averaged down to mono."""
+        import wave
         with tempfile.TemporaryDirectory() as tmpdir:
-            wav_path = os.path.join(tmpdir, 'test_float.wav')
-            data = np.array([0.1, 0.5, -0.3, 0.2], dtype=np.float32)
-            
-            trainer.write_wav_mono(wav_path, data, 44100)
+            wav_path = os.path.join(tmpdir, 'stereo.wav')
+            left = np.array([1000, -2000, 32767, -32768], dtype=np.int16)
+            right = np.array([3000, 2000, 32767, -32768], dtype=np.int16)
+            interleaved = np.column_stack([left, right]).ravel()
+            with wave.open(wav_path, 'w') as wf:
+                wf.setnchannels(2)
+                wf.setsampwidth(2)
+                wf.setframerate(22050)
+                wf.writeframes(interleaved.tobytes())
+
             read_data, read_sr = trainer.read_wav_mono(wav_path)
-            
-            self.assertEqual(read_sr, 44100)
-            self.assertEqual(len(read_data), len(data))
+
+            self.assertEqual(read_sr, 22050)
             self.assertEqual(read_data.dtype, np.int16)
+            np.testing.assert_array_equal(read_data, [2000, 0, 32767, -32768])
 
 
 class TestFrequencyConversion(unittest.TestCase):
@@ -252,6 +309,13 @@ class TestFrequencyConversion(unittest.TestCase):
         # A5 = 880 Hz
         self.assertAlmostEqual(trainer.midi_to_freq(81), 880.0, places=0)
 
+    def test_notes_to_freqs_lookup_and_fallback(self):
+        """Test the frequency table lookup, including notes outside 0..127."""
+        freqs = trainer._notes_to_freqs([57, 69, 81])
+        np.testing.assert_allclose(freqs, [220.0, 440.0, 880.0])
+        freqs = trainer._notes_to_freqs([69, 129])
+        np.testing.assert_allclose(freqs, [440.0, trainer.midi_to_freq(129)])
+
 
 if __name__ == '__main__':
     unittest.main()
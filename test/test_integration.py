@@ -12,6 +12,7 @@ import os
 import sys
 import json
 import yaml
+import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -85,6 +86,29 @@ class TestSynthSimpleWAV(unittest.TestCase):
             with wave.open(out_wav, 'rb') as wf:
                 self.assertEqual(wf.getframerate(), 48000)
 
+    def test_synth_simple_wav_numba_matches_numpy(self):
+        """Test that the optional Numba kernel renders the same audio as the NumPy path."""
+        if trainer._get_synth_core() is None:
+            self.skipTest('numba not installed')
+        import wave
+        with tempfile.TemporaryDirectory() as tmpdir:
+            jit_wav = os.path.join(tmpdir, 'jit.wav')
+            np_wav = os.path.join(tmpdir, 'np.wav')
+            trainer.synth_simple_wav([60, 64, 67], 0.5, jit_wav)
+            saved = trainer._SYNTH_CORE
+            trainer._SYNTH_CORE = False
+            try:
+                trainer.synth_simple_wav([60, 64, 67], 0.5, np_wav)
+            finally:
+                trainer._SYNTH_CORE = saved
+
+            frames = []
+            for path in (jit_wav, np_wav):
+                with wave.open(path, 'rb') as wf:
+                    frames.append(np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16))
+            self.assertEqual(len(frames[0]), len(frames[1]))
+            self.assertLessEqual(int(np.max(np.abs(frames[0].astype(np.int32) - frames[1]))), 1)
+
 
 class TestWriteMIDIForExercise(unittest.TestCase):
     """Test write_midi_for_exercise function."""
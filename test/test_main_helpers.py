@@ -46,6 +46,16 @@ class TestMainHelpers(unittest.TestCase):
         # repetitions_per_exercise should cause more entries per unique exercise
         self.assertTrue(len(final_list) >= 1)
 
+    def test_session_output_name(self):
+        cfg = {'output': {'filename': 'Out_{scale}_{date}.mp3'}}
+        args = SimpleNamespace(output=None)
+        name = trainer.session_output_name(cfg, args, 'A minor')
+        self.assertTrue(name.startswith('Out_A_minor_'))
+        self.assertTrue(name.endswith('.mp3'))
+        # --output overrides the template
+        args = SimpleNamespace(output='explicit.mid')
+        self.assertEqual(trainer.session_output_name(cfg, args, 'A minor'), 'explicit.mid')
+
 
 if __name__ == '__main__':
     unittest.main()
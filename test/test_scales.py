@@ -91,6 +91,18 @@ class TestScalesParsing(unittest.TestCase):
         self.assertEqual(seqs[0][1][0][0], midi_fsharp3)
         self.assertEqual(seqs[1][1][0][0], midi_f3)
 
+    def test_load_scales_config_reuses_parse_until_file_changes(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'scales.yaml')
+            with open(path, 'w') as f:
+                yaml.safe_dump({'Gmajor': {'F': '#'}}, f)
+            first = trainer.load_scales_config(path)
+            self.assertIs(trainer.load_scales_config(path), first)
+            with open(path, 'w') as f:
+                yaml.safe_dump({'Fmajor': {'B': 'b'}, 'Gmajor': {'F': '#'}}, f)
+            self.assertEqual(trainer.load_scales_config(path), {'Fmajor': {'B': 'b'}, 'Gmajor': {'F': '#'}})
+
 if __name__ == "__main__":
     unittest.main()#!/usr/bin/env python3
 import unittest